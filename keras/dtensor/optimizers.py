@@ -82,7 +82,8 @@ class Optimizer(optimizer_lib._BaseOptimizer):
         The create variables name will follow the pattern
         `{variable_name}/{model_variable.name}`, e.g., `momemtum/dense_1`.
       initial_value: The initial value of the optimizer variable, if None, the
-        value will be default to 0.
+        value will be default to 0. If it is a tensor, the optimizer variable
+        takes its dtype instead of the dtype of `model_variable`.
 
     Returns:
       An optimizer variable.
@@ -95,10 +96,13 @@ class Optimizer(optimizer_lib._BaseOptimizer):
       initial_value = dtensor.copy_to_mesh(
           initial_value,
           dtensor.Layout.replicated(self._mesh, rank=initial_value.shape.rank))
+    dtype = (
+        initial_value.dtype
+        if tf.is_tensor(initial_value) else model_variable.dtype)
     return dtensor.DVariable(
         initial_value=initial_value,
         name=f'{variable_name}/{model_variable._shared_name}',
-        dtype=model_variable.dtype,
+        dtype=dtype,
         trainable=False)
 
   def aggregate_gradients(self, grads_and_vars):
@@ -188,11 +192,14 @@ class Adagrad(Optimizer, adagrad.Adagrad):
                gradients_clip_option=None,
                ema_option=None,
                name='Adagrad',
-               mesh=None):
+               mesh=None,
+               accumulator_dtype=None):
     Optimizer.__init__(self, name=name, mesh=mesh)
     self._learning_rate = self._build_learning_rate(learning_rate)
     self.initial_accumulator_value = initial_accumulator_value
     self.epsilon = epsilon
+    self.accumulator_dtype = (
+        tf.as_dtype(accumulator_dtype) if accumulator_dtype else None)
 
 
 class Adam(Optimizer, adam.Adam):
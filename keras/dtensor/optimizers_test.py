@@ -98,6 +98,28 @@ class OptimizersTest(test_util.DTensorBaseTest):
     expect_variable_names.extend(['iteration', 'learning_rate'])
     self.assertCountEqual(all_names, expect_variable_names)
 
+  def test_adagrad_accumulator_dtype(self):
+    optimizer = optimizers.Adagrad(
+        mesh=self.mesh, accumulator_dtype=tf.bfloat16)
+    variable_init_value = tf.ones(
+        [4, 4], dtype=tf.float32,
+        layout=dtensor.Layout.replicated(self.mesh, rank=2))
+    model_variable = dtensor.DVariable(variable_init_value,
+                                       trainable=True)
+
+    grads = tf.ones_like(variable_init_value)
+    optimizer.apply_gradients(zip([grads], [model_variable]))
+
+    accumulator = optimizer._accumulators[0]
+    self.assertEqual(accumulator.dtype, tf.bfloat16)
+    self.assertEqual(model_variable.dtype, tf.float32)
+    self.assertAllClose(
+        self.evaluate(tf.cast(accumulator, tf.float32)),
+        np.full([4, 4], 1.1), rtol=1e-2, atol=1e-2)
+    self.assertAllClose(
+        self.evaluate(model_variable),
+        np.full([4, 4], 1.0 - 0.001 / np.sqrt(1.1)), rtol=1e-3, atol=1e-3)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -15,8 +15,6 @@
 """Gated Recurrent Unit layer."""
 # pylint: disable=g-classes-have-attributes,g-direct-tensorflow-import
 
-import uuid
-
 from keras import activations
 from keras import backend
 from keras.engine import base_layer
@@ -658,6 +656,53 @@ def gpu_gru(inputs, init_h, kernel, recurrent_kernel, bias, mask, time_major,
       gru_lstm_utils.RUNTIME_GPU)
 
 
+def gpu_gru_with_fallback(inputs, init_h, kernel, recurrent_kernel, bias,
+                          mask, time_major, go_backwards, sequence_lengths,
+                          zero_output_for_mask):
+  """Use cuDNN kernel when mask is none or strictly right padded."""
+  if mask is None:
+    return gpu_gru(
+        inputs=inputs,
+        init_h=init_h,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths)
+
+  def cudnn_gru_fn():
+    return gpu_gru(
+        inputs=inputs,
+        init_h=init_h,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths)
+
+  def standard_gru_fn():
+    return standard_gru(
+        inputs=inputs,
+        init_h=init_h,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths,
+        zero_output_for_mask=zero_output_for_mask)
+
+  return tf.cond(
+      gru_lstm_utils.is_cudnn_supported_inputs(mask, time_major),
+      true_fn=cudnn_gru_fn,
+      false_fn=standard_gru_fn)
+
+
 def gru_with_backend_selection(inputs, init_h, kernel, recurrent_kernel, bias,
                                mask, time_major, go_backwards, sequence_lengths,
                                zero_output_for_mask):
@@ -708,52 +753,6 @@ def gru_with_backend_selection(inputs, init_h, kernel, recurrent_kernel, bias,
       'zero_output_for_mask': zero_output_for_mask,
   }
 
-  def gpu_gru_with_fallback(inputs, init_h, kernel, recurrent_kernel, bias,
-                            mask, time_major, go_backwards, sequence_lengths,
-                            zero_output_for_mask):
-    """Use cuDNN kernel when mask is none or strictly right padded."""
-    if mask is None:
-      return gpu_gru(
-          inputs=inputs,
-          init_h=init_h,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths)
-
-    def cudnn_gru_fn():
-      return gpu_gru(
-          inputs=inputs,
-          init_h=init_h,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths)
-
-    def standard_gru_fn():
-      return standard_gru(
-          inputs=inputs,
-          init_h=init_h,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths,
-          zero_output_for_mask=zero_output_for_mask)
-
-    return tf.cond(
-        gru_lstm_utils.is_cudnn_supported_inputs(mask, time_major),
-        true_fn=cudnn_gru_fn,
-        false_fn=standard_gru_fn)
-
   if gru_lstm_utils.use_new_gru_lstm_impl():
     # Chooses the implementation dynamically based on the running device.
     (last_output, outputs, new_h,
@@ -765,25 +764,11 @@ def gru_with_backend_selection(inputs, init_h, kernel, recurrent_kernel, bias,
                  lambda: gpu_gru_with_fallback(**params)
          }, lambda: standard_gru(**params))
   else:
-    # Each time a `tf.function` is called, we will give it a unique
-    # identifiable API name, so that Grappler won't get confused when it
-    # sees multiple GRU layers added into same graph, and it will be able
-    # to pair up the different implementations across them.
-    api_name = 'gru_' + str(uuid.uuid4())
-    supportive_attribute = {
-        'time_major': time_major,
-        'go_backwards': go_backwards,
-    }
-    defun_standard_gru = gru_lstm_utils.generate_defun_backend(
-        api_name, gru_lstm_utils.CPU_DEVICE_NAME, standard_gru,
-        supportive_attribute)
-    defun_gpu_gru = gru_lstm_utils.generate_defun_backend(
-        api_name, gru_lstm_utils.GPU_DEVICE_NAME, gpu_gru_with_fallback,
-        supportive_attribute)
-
-    # Call the normal GRU impl and register the cuDNN impl function. The
-    # grappler will kick in during session execution to optimize the graph.
+    # Call the normal GRU impl, the cuDNN impl function is registered in the
+    # graph alongside it. The grappler will kick in during session execution
+    # to optimize the graph.
+    defun_standard_gru, _ = gru_lstm_utils.get_defun_backends(
+        'gru', standard_gru, gpu_gru_with_fallback, params)
     last_output, outputs, new_h, runtime = defun_standard_gru(**params)
-    gru_lstm_utils.function_register(defun_gpu_gru, **params)
 
   return last_output, outputs, new_h, runtime
@@ -17,12 +17,15 @@
 See also: lstm_test.py, gru_test.py.
 """
 
+import gc
 import os
+import weakref
 
 from absl.testing import parameterized
 import keras
 from keras.layers import embeddings
 from keras.layers.rnn import gru
+from keras.layers.rnn import gru_lstm_utils
 from keras.layers.rnn import lstm
 from keras.testing_infra import test_combinations
 from keras.testing_infra import test_utils
@@ -146,5 +149,80 @@ class RNNV2Test(test_combinations.TestCase):
       self.assertAllClose(outputs[i], outputs[i + 1], atol=1e-4)
 
 
+class DefunBackendsTest(test_combinations.TestCase):
+
+  def _params(self, layer_name, batch_size):
+    units = 2
+    input_dim = 4
+    num_gates = 4 if layer_name == 'lstm' else 3
+    params = {
+        'inputs': tf.zeros([batch_size, 3, input_dim]),
+        'init_h': tf.zeros([batch_size, units]),
+        'kernel': tf.zeros([input_dim, num_gates * units]),
+        'recurrent_kernel': tf.zeros([units, num_gates * units]),
+        'mask': None,
+        'time_major': False,
+        'go_backwards': False,
+        'sequence_lengths': None,
+        'zero_output_for_mask': False,
+    }
+    if layer_name == 'lstm':
+      params['init_c'] = tf.zeros([batch_size, units])
+      params['bias'] = tf.zeros([num_gates * units])
+    else:
+      params['bias'] = tf.zeros([2, num_gates * units])
+    return params
+
+  @parameterized.named_parameters(
+      ('gru', 'gru', gru.standard_gru, gru.gpu_gru_with_fallback),
+      ('lstm', 'lstm', lstm.standard_lstm, lstm.gpu_lstm_with_fallback))
+  def test_defun_backends_reused_per_signature(self, layer_name, standard_fn,
+                                               gpu_fn):
+    with tf.Graph().as_default():
+      defuns = gru_lstm_utils.get_defun_backends(
+          layer_name, standard_fn, gpu_fn, self._params(layer_name, 2))
+      same_signature_defuns = gru_lstm_utils.get_defun_backends(
+          layer_name, standard_fn, gpu_fn, self._params(layer_name, 2))
+      other_signature_defuns = gru_lstm_utils.get_defun_backends(
+          layer_name, standard_fn, gpu_fn, self._params(layer_name, 3))
+
+    self.assertIs(defuns[0], same_signature_defuns[0])
+    self.assertIs(defuns[1], same_signature_defuns[1])
+    self.assertIsNot(defuns[0], other_signature_defuns[0])
+    self.assertIsNot(defuns[1], other_signature_defuns[1])
+
+  @parameterized.named_parameters(
+      ('gru', 'gru', gru.standard_gru, gru.gpu_gru_with_fallback),
+      ('lstm', 'lstm', lstm.standard_lstm, lstm.gpu_lstm_with_fallback))
+  def test_defun_backends_keyed_by_implementations(self, layer_name,
+                                                   standard_fn, gpu_fn):
+    with tf.Graph().as_default():
+      defuns = gru_lstm_utils.get_defun_backends(
+          layer_name, standard_fn, gpu_fn, self._params(layer_name, 2))
+      # Same layer name and signature, but another pair of implementations.
+      swapped_defuns = gru_lstm_utils.get_defun_backends(
+          layer_name, gpu_fn, standard_fn, self._params(layer_name, 2))
+
+    self.assertIsNot(defuns[0], swapped_defuns[0])
+    self.assertIsNot(defuns[1], swapped_defuns[1])
+
+  @parameterized.named_parameters(
+      ('gru', 'gru', gru.standard_gru, gru.gpu_gru_with_fallback),
+      ('lstm', 'lstm', lstm.standard_lstm, lstm.gpu_lstm_with_fallback))
+  def test_defun_backends_released_with_graph(self, layer_name, standard_fn,
+                                              gpu_fn):
+    graph = tf.Graph()
+    with graph.as_default():
+      params = self._params(layer_name, 2)
+      defun_standard_fn, _ = gru_lstm_utils.get_defun_backends(
+          layer_name, standard_fn, gpu_fn, params)
+      defun_standard_fn(**params)
+    graph_ref = weakref.ref(graph)
+
+    del graph, params, defun_standard_fn
+    gc.collect()
+    self.assertIsNone(graph_ref())
+
+
 if __name__ == '__main__':
   tf.test.main()
@@ -15,6 +15,7 @@
 """Utilities used by both the GRU and LSTM classes."""
 # pylint: disable=g-direct-tensorflow-import
 
+import hashlib
 import uuid
 
 import tensorflow.compat.v2 as tf
@@ -37,6 +38,13 @@ RUNTIME_UNKNOWN = 0
 RUNTIME_CPU = 1
 RUNTIME_GPU = 2
 
+# Name of the graph attribute holding the standard/cuDNN defun pairs created by
+# `get_defun_backends`, keyed by the layer name and signature of the call. The
+# pairs are stored on the graph itself rather than in a module level map keyed
+# weakly by graph: the traced defuns reference the graph, so such a map would
+# keep every graph alive through its values.
+_DEFUN_REGISTRY_ATTRIBUTE = '_keras_rnn_defun_backends'
+
 CUDNN_AVAILABLE_MSG = 'Layer %s will use cuDNN kernels when running on GPU.'
 CUDNN_NOT_AVAILABLE_MSG = ('Layer %s will not use cuDNN kernels since it '
                            'doesn\'t meet the criteria. It will '
@@ -202,6 +210,62 @@ def generate_defun_backend(unique_api_name, preferred_device, func,
       func=func, attributes=function_attributes, autograph=False)
 
 
+def get_defun_backends(layer_name, standard_fn, gpu_fn, params):
+  """Returns the standard and cuDNN defuns of a layer for the given params.
+
+  The pair of defuns is created, and the cuDNN one registered, only once per
+  graph for each distinct pair of implementations and call signature, so that
+  calls with the same signature reuse the same functions instead of growing
+  the function library on every call.
+
+  Args:
+    layer_name: Name of the layer type, 'gru' or 'lstm', used as api name
+      prefix.
+    standard_fn: Python function of the generic implementation.
+    gpu_fn: Python function of the cuDNN implementation, with the same
+      signature as `standard_fn`.
+    params: Dict of the keyword arguments passed to the implementations. It
+      must contain the `time_major` and `go_backwards` entries, which are also
+      set as attributes on the defuns.
+
+  Returns:
+    A tuple `(defun_standard_fn, defun_gpu_fn)`.
+  """
+  signature = (layer_name,) + tuple(
+      (name, tf.TensorSpec(value.shape, value.dtype)
+       if tf.is_tensor(value) else value)
+      for name, value in sorted(params.items()))
+  # The implementations are part of the key, so that different pairs of
+  # functions under the same layer name and signature never share defuns.
+  key = (standard_fn, gpu_fn, signature)
+  graph = tf.compat.v1.get_default_graph()
+  graph_registry = getattr(graph, _DEFUN_REGISTRY_ATTRIBUTE, None)
+  if graph_registry is None:
+    graph_registry = {}
+    setattr(graph, _DEFUN_REGISTRY_ATTRIBUTE, graph_registry)
+  if key not in graph_registry:
+    # Each signature gets a unique identifiable API name, so that Grappler
+    # won't get confused when it sees multiple implementations added into same
+    # graph, and it will be able to pair up the different implementations
+    # across them. The name is derived from the implementations and signature
+    # so that it is stable across graphs and processes.
+    fn_names = tuple(
+        f'{fn.__module__}.{fn.__qualname__}' for fn in (standard_fn, gpu_fn))
+    api_name = layer_name + '_' + hashlib.blake2b(
+        repr(fn_names + signature).encode(), digest_size=8).hexdigest()
+    supportive_attribute = {
+        'time_major': params['time_major'],
+        'go_backwards': params['go_backwards'],
+    }
+    defun_standard_fn = generate_defun_backend(
+        api_name, CPU_DEVICE_NAME, standard_fn, supportive_attribute)
+    defun_gpu_fn = generate_defun_backend(
+        api_name, GPU_DEVICE_NAME, gpu_fn, supportive_attribute)
+    function_register(defun_gpu_fn, **params)
+    graph_registry[key] = (defun_standard_fn, defun_gpu_fn)
+  return graph_registry[key]
+
+
 def get_context_device_type():
   """Parse the current context and return the device type, eg CPU/GPU."""
   current_device = get_device_name()
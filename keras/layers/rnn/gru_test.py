@@ -813,6 +813,39 @@ class GRUGraphRewriteTest(test_combinations.TestCase):
     model = keras.models.Model(inputs=inputs, outputs=[outputs, runtime])
     self._test_runtime_with_model(model)
 
+  @test_utils.run_v2_only
+  def test_GRU_layers_share_defuns_in_graph(self):
+    # Layers created eagerly and called in a graph take the legacy path of
+    # `gru_with_backend_selection`, which registers the defun backends.
+    def make_layer():
+      return gru.GRU(
+          self.rnn_state_size,
+          kernel_initializer=keras.initializers.Constant(0.1),
+          recurrent_initializer=keras.initializers.Constant(0.2))
+
+    x = np.random.random(
+        (self.batch, self.timestep, self.input_shape)).astype(np.float32)
+    expected = make_layer()(x)
+    first_layer = make_layer()
+    second_layer = make_layer()
+
+    graph = tf.Graph()
+    with graph.as_default():
+      inputs = tf.constant(x)
+      first_output = first_layer(inputs)
+      num_functions = len(graph.as_graph_def().library.function)
+      second_output = second_layer(inputs)
+      # The second layer has the same call signature as the first one, so it
+      # reuses its defuns instead of adding new ones to the function library.
+      self.assertLen(graph.as_graph_def().library.function, num_functions)
+
+      with tf.compat.v1.Session(config=_config) as sess:
+        sess.run(tf.compat.v1.global_variables_initializer())
+        first_output, second_output = sess.run([first_output, second_output])
+
+    self.assertAllClose(first_output, expected)
+    self.assertAllClose(second_output, expected)
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -15,8 +15,6 @@
 """Long Short-Term Memory layer."""
 # pylint: disable=g-classes-have-attributes,g-direct-tensorflow-import
 
-import uuid
-
 from keras import activations
 from keras import backend
 from keras.engine import base_layer
@@ -693,6 +691,56 @@ def gpu_lstm(inputs, init_h, init_c, kernel, recurrent_kernel, bias, mask,
       gru_lstm_utils.RUNTIME_GPU)
 
 
+def gpu_lstm_with_fallback(inputs, init_h, init_c, kernel, recurrent_kernel,
+                           bias, mask, time_major, go_backwards,
+                           sequence_lengths, zero_output_for_mask):
+  """Use cuDNN kernel when mask is none or strictly right padded."""
+  if mask is None:
+    return gpu_lstm(
+        inputs=inputs,
+        init_h=init_h,
+        init_c=init_c,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths)
+
+  def cudnn_lstm_fn():
+    return gpu_lstm(
+        inputs=inputs,
+        init_h=init_h,
+        init_c=init_c,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths)
+
+  def stardard_lstm_fn():
+    return standard_lstm(
+        inputs=inputs,
+        init_h=init_h,
+        init_c=init_c,
+        kernel=kernel,
+        recurrent_kernel=recurrent_kernel,
+        bias=bias,
+        mask=mask,
+        time_major=time_major,
+        go_backwards=go_backwards,
+        sequence_lengths=sequence_lengths,
+        zero_output_for_mask=zero_output_for_mask)
+
+  return tf.cond(
+      gru_lstm_utils.is_cudnn_supported_inputs(mask, time_major),
+      true_fn=cudnn_lstm_fn,
+      false_fn=stardard_lstm_fn)
+
+
 def lstm_with_backend_selection(inputs, init_h, init_c, kernel,
                                 recurrent_kernel, bias, mask, time_major,
                                 go_backwards, sequence_lengths,
@@ -746,55 +794,6 @@ def lstm_with_backend_selection(inputs, init_h, init_c, kernel,
       'zero_output_for_mask': zero_output_for_mask,
   }
 
-  def gpu_lstm_with_fallback(inputs, init_h, init_c, kernel, recurrent_kernel,
-                             bias, mask, time_major, go_backwards,
-                             sequence_lengths, zero_output_for_mask):
-    """Use cuDNN kernel when mask is none or strictly right padded."""
-    if mask is None:
-      return gpu_lstm(
-          inputs=inputs,
-          init_h=init_h,
-          init_c=init_c,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths)
-
-    def cudnn_lstm_fn():
-      return gpu_lstm(
-          inputs=inputs,
-          init_h=init_h,
-          init_c=init_c,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths)
-
-    def stardard_lstm_fn():
-      return standard_lstm(
-          inputs=inputs,
-          init_h=init_h,
-          init_c=init_c,
-          kernel=kernel,
-          recurrent_kernel=recurrent_kernel,
-          bias=bias,
-          mask=mask,
-          time_major=time_major,
-          go_backwards=go_backwards,
-          sequence_lengths=sequence_lengths,
-          zero_output_for_mask=zero_output_for_mask)
-
-    return tf.cond(
-        gru_lstm_utils.is_cudnn_supported_inputs(mask, time_major),
-        true_fn=cudnn_lstm_fn,
-        false_fn=stardard_lstm_fn)
-
   if gru_lstm_utils.use_new_gru_lstm_impl():
     # Chooses the implementation dynamically based on the running device.
     (last_output, outputs, new_h, new_c,
@@ -806,25 +805,11 @@ def lstm_with_backend_selection(inputs, init_h, init_c, kernel,
                  lambda: gpu_lstm_with_fallback(**params)
          }, lambda: standard_lstm(**params))
   else:
-    # Each time a `tf.function` is called, we will give it a unique
-    # identifiable API name, so that Grappler won't get confused when it
-    # sees multiple LSTM layers added into same graph, and it will be able
-    # to pair up the different implementations across them.
-    api_name = 'lstm_' + str(uuid.uuid4())
-    supportive_attribute = {
-        'time_major': time_major,
-        'go_backwards': go_backwards,
-    }
-    defun_standard_lstm = gru_lstm_utils.generate_defun_backend(
-        api_name, gru_lstm_utils.CPU_DEVICE_NAME, standard_lstm,
-        supportive_attribute)
-    defun_gpu_lstm = gru_lstm_utils.generate_defun_backend(
-        api_name, gru_lstm_utils.GPU_DEVICE_NAME, gpu_lstm_with_fallback,
-        supportive_attribute)
-
-    # Call the normal LSTM impl and register the cuDNN impl function. The
-    # grappler will kick in during session execution to optimize the graph.
+    # Call the normal LSTM impl, the cuDNN impl function is registered in the
+    # graph alongside it. The grappler will kick in during session execution
+    # to optimize the graph.
+    defun_standard_lstm, _ = gru_lstm_utils.get_defun_backends(
+        'lstm', standard_lstm, gpu_lstm_with_fallback, params)
     last_output, outputs, new_h, new_c, runtime = defun_standard_lstm(**params)
-    gru_lstm_utils.function_register(defun_gpu_lstm, **params)
 
   return last_output, outputs, new_h, new_c, runtime
@@ -21,6 +21,32 @@ import tensorflow.compat.v2 as tf
 # pylint: disable=g-direct-tensorflow-import
 from tensorflow.python.util.tf_export import keras_export
 
+# On GPU, sparse gradients touching more than this fraction of the variable's
+# rows are applied as a dense update instead of a gather/scatter. The choice is
+# made at trace time, so it only applies when the number of gradient rows is
+# statically known. `model.fit` traces with an unknown batch size, so its
+# sparse gradients always take the gather/scatter path.
+_DENSE_UPDATE_MIN_DENSITY = 0.1
+
+
+def _coalesce(indices, values):
+  """Sums `values` and their squares over duplicated `indices`.
+
+  Args:
+    indices: 1-D integer tensor of row indices, which may contain duplicates.
+    values: tensor of gradient rows, whose first dimension matches `indices`.
+
+  Returns:
+    A tuple `(unique_indices, summed_values, summed_squared_values)`.
+  """
+  unique_indices, new_index_positions = tf.unique(indices)
+  num_unique_indices = tf.shape(unique_indices)[0]
+  summed_values = tf.math.unsorted_segment_sum(
+      values, new_index_positions, num_unique_indices)
+  summed_squared_values = tf.math.unsorted_segment_sum(
+      values * values, new_index_positions, num_unique_indices)
+  return unique_indices, summed_values, summed_squared_values
+
 
 # pylint: disable=g-classes-have-attributes
 @generic_utils.register_keras_serializable()
@@ -59,6 +85,11 @@ class Adagrad(optimizer.Optimizer):
       `optimizer_experimental.Optimizer`.
     name: Optional name prefix for the operations created when applying
       gradients. Defaults to `"Adagrad"`.
+    accumulator_dtype: Optional dtype of the accumulators, e.g.
+      `tf.bfloat16`. Storing the accumulators in a narrower type than the model
+      variables halves the optimizer state memory and bandwidth, which helps
+      large embedding tables. The update itself is still computed in the
+      variable dtype. Defaults to `None`, which uses the variable dtype.
     **kwargs: see the `**kwargs` argument of `optimizer_experimental.Optimizer`.
 
   Reference:
@@ -78,6 +109,7 @@ class Adagrad(optimizer.Optimizer):
                ema_overwrite_frequency=None,
                jit_compile=False,
                name='Adagrad',
+               accumulator_dtype=None,
                **kwargs):
     super(Adagrad, self).__init__(
         clipnorm=clipnorm,
@@ -92,6 +124,8 @@ class Adagrad(optimizer.Optimizer):
     self._learning_rate = self._build_learning_rate(learning_rate)
     self.initial_accumulator_value = initial_accumulator_value
     self.epsilon = epsilon
+    self.accumulator_dtype = (
+        tf.as_dtype(accumulator_dtype) if accumulator_dtype else None)
 
   def build(self, var_list):
     super().build(var_list)
@@ -100,32 +134,96 @@ class Adagrad(optimizer.Optimizer):
     self._built = True
     self._accumulators = []
     initializer = initializers.Constant(self.initial_accumulator_value)
+    # Variables of the same shape and dtype share one initial value tensor.
+    initial_values = {}
     for var in var_list:
+      dtype = self.accumulator_dtype or var.dtype
+      key = (tuple(var.shape.as_list()), dtype)
+      if key not in initial_values:
+        initial_values[key] = initializer(shape=var.shape, dtype=dtype)
       self._accumulators.append(
-          self.add_variable_from_reference(
-              var, 'accumulator', initializer(shape=var.shape,
-                                              dtype=var.dtype)))
+          self.add_variable_from_reference(var, 'accumulator',
+                                           initial_values[key]))
 
   def update_step(self, grad, variable):
     """Update step given gradient and the associated model variable."""
-    if self._var_key(variable) not in self._index_dict:
+    index = self._index_dict.get(self._var_key(variable))
+    if index is None:
       raise KeyError(f'Optimizer cannot recognize variable {variable.name}, '
                      f'this usually means you are calling an optimizer '
                      f'previously used on a different model. Please try '
                      f'creating a new optimizer instance.')
     lr = tf.cast(self.learning_rate, variable.dtype)
+    accumulator = self._accumulators[index]
 
-    var_key = self._var_key(variable)
-    accumulator = self._accumulators[self._index_dict[var_key]]
-
+    # With `accumulator_dtype` set, the accumulator is read and written back in
+    # its own dtype, but the update is computed in the variable dtype.
     if isinstance(grad, tf.IndexedSlices):
-      # Sparse gradients.
-      accumulator.scatter_add(
-          tf.IndexedSlices(grad.values * grad.values, grad.indices))
+      if self._use_dense_update(grad, variable):
+        # A single fused elementwise update over the whole variable is faster
+        # than gathering and scattering most of its rows.
+        num_rows = tf.shape(variable)[0]
+        self._dense_update_step(
+            tf.math.unsorted_segment_sum(grad.values, grad.indices, num_rows),
+            variable,
+            accumulator,
+            lr,
+            squared_grad=tf.math.unsorted_segment_sum(
+                grad.values * grad.values, grad.indices, num_rows))
+      else:
+        self._sparse_update_step(grad.values, grad.indices, variable,
+                                 accumulator, lr)
+    else:
+      self._dense_update_step(grad, variable, accumulator, lr)
+
+  def _use_dense_update(self, grad, variable):
+    """Whether the `tf.IndexedSlices` `grad` is applied as a dense update."""
+    num_indices = tf.compat.dimension_value(grad.indices.shape[0])
+    num_rows = tf.compat.dimension_value(variable.shape[0])
+    if num_indices is None or not num_rows:
+      return False
+    device_type = tf.DeviceSpec.from_string(variable.device).device_type
+    return (device_type == 'GPU' and
+            num_indices > _DENSE_UPDATE_MIN_DENSITY * num_rows)
+
+  def _dense_update_step(self, grad, variable, accumulator, lr,
+                         squared_grad=None):
+    """Update step for a dense gradient."""
+    if squared_grad is None:
+      squared_grad = grad * grad
+    # The whole update is a single elementwise chain, which XLA fuses into one
+    # kernel when `jit_compile=True`.
+    if accumulator.dtype == variable.dtype:
+      # `assign_add` is atomic, so concurrent updates from asynchronous
+      # workers (e.g. under `ParameterServerStrategy`) are not lost.
+      new_accumulator = accumulator.assign_add(squared_grad)
+    else:
+      new_accumulator = tf.cast(accumulator, variable.dtype) + squared_grad
+      accumulator.assign(tf.cast(new_accumulator, accumulator.dtype))
+    variable.assign_sub(
+        lr * grad * tf.math.rsqrt(new_accumulator + self.epsilon))
+
+  def _sparse_update_step(self, grad_values, grad_indices, variable,
+                          accumulator, lr):
+    """Update step for a gradient given as `tf.IndexedSlices` components."""
+    # Only the rows referenced by `grad_indices` are read and written, instead
+    # of densifying the gradient over the whole variable.
+    indices, values, squared_values = _coalesce(grad_indices, grad_values)
+    if accumulator.dtype == variable.dtype:
+      # Atomic for the same reason as `assign_add` in `_dense_update_step`.
+      accumulator.scatter_add(tf.IndexedSlices(squared_values, indices))
+      sparse_accumulator = tf.gather(accumulator, indices=indices)
     else:
-      # Dense gradients.
-      accumulator.assign_add(grad * grad)
-    variable.assign_sub(lr * grad / tf.sqrt(accumulator + self.epsilon))
+      sparse_accumulator = tf.cast(
+          tf.gather(accumulator, indices=indices),
+          variable.dtype) + squared_values
+      accumulator.scatter_update(
+          tf.IndexedSlices(
+              tf.cast(sparse_accumulator, accumulator.dtype), indices))
+    variable.scatter_sub(
+        tf.IndexedSlices(
+            lr * values * tf.math.rsqrt(sparse_accumulator + self.epsilon),
+            indices))
 
   def get_config(self):
     config = super(Adagrad, self).get_config()
@@ -134,5 +232,7 @@ class Adagrad(optimizer.Optimizer):
         'learning_rate': self._serialize_hyperparameter(self._learning_rate),
         'initial_accumulator_value': self.initial_accumulator_value,
         'epsilon': self.epsilon,
+        'accumulator_dtype':
+            self.accumulator_dtype.name if self.accumulator_dtype else None,
     })
     return config
@@ -347,7 +347,8 @@ class _BaseOptimizer(tf.Module):
         The create variables name will follow the pattern
         `{variable_name}/{model_variable.name}`, e.g., `momemtum/dense_1`.
       initial_value: The initial value of the optimizer variable, if None, the
-        value will be default to 0.
+        value will be default to 0. If it is a tensor, the optimizer variable
+        takes its dtype instead of the dtype of `model_variable`.
 
     Returns:
       An optimizer variable.
@@ -355,10 +356,13 @@ class _BaseOptimizer(tf.Module):
     if initial_value is None:
       initial_value = tf.zeros(
           shape=model_variable.shape, dtype=model_variable.dtype)
+    dtype = (
+        initial_value.dtype
+        if tf.is_tensor(initial_value) else model_variable.dtype)
     return tf.Variable(
         initial_value=initial_value,
         name=f"{variable_name}/{model_variable._shared_name}",  # pylint: disable=protected-access
-        dtype=model_variable.dtype,
+        dtype=dtype,
         trainable=False)
 
   def minimize(self, loss, var_list, tape=None):
@@ -739,15 +743,17 @@ class Optimizer(_BaseOptimizer):
     """Create an optimizer variable.
 
     Create an optimizer variable based on the information of model variable.
-    The created optimizer variable will have the same shape and dtype as the
-    model variable, and placed at the same device.
+    The created optimizer variable will have the same shape as the model
+    variable, and placed at the same device. Its dtype is the one of
+    `initial_value` if that is a tensor, otherwise the model variable's.
 
     Args:
       model_variable: The corresponding model variable to the optimizer variable
         to be created.
       variable_name: The name prefix of the optimizer variable to be created.
       initial_value: The initial value of the optimizer variable, if None, the
-        value will be default to 0.
+        value will be default to 0. If it is a tensor, the optimizer variable
+        takes its dtype instead of the dtype of `model_variable`.
 
     Returns:
       An optimizer variable.
@@ -5,6 +5,7 @@ More context in go/new-keras-optimizer
 
 import os
 import re
+from unittest import mock
 
 from absl import logging
 from absl.testing import parameterized
@@ -206,6 +207,95 @@ class OptimizerFuntionalityTest(tf.test.TestCase, parameterized.TestCase):
     optimizer.apply_gradients(zip(grads, [var1, var2]))
     self.assertAllEqual([var1.numpy(), var2.numpy()], [-0.125, -0.125])
 
+  def testAdagradSparseRepeatedIndices(self):
+    var = tf.Variable([[1.0], [2.0]])
+    grads = tf.IndexedSlices(
+        tf.constant([[0.1], [0.1]]), tf.constant([1, 1]), dense_shape=[2, 1])
+    optimizer = adagrad_new.Adagrad(learning_rate=1.0)
+    optimizer.apply_gradients(zip([grads], [var]))
+    # Row 1 accumulates both squared values and moves by their sum, row 0 is
+    # left untouched.
+    accumulator = 0.1 + 0.1**2 + 0.1**2
+    self.assertAllClose(
+        var, [[1.0], [2.0 - 0.2 / np.sqrt(accumulator + 1e-7)]])
+    self.assertAllClose(optimizer._accumulators[0], [[0.1], [accumulator]])
+
+  def testAdagradSparseAsDenseUpdate(self):
+    grads = tf.IndexedSlices(
+        tf.constant([[0.1], [0.2], [0.3]]), tf.constant([0, 2, 2]),
+        dense_shape=[3, 1])
+    sparse_var = tf.Variable([[1.0], [2.0], [3.0]])
+    dense_var = tf.Variable([[1.0], [2.0], [3.0]])
+    sparse_optimizer = adagrad_new.Adagrad(learning_rate=0.1)
+    dense_optimizer = adagrad_new.Adagrad(learning_rate=0.1)
+    # Force the densified update that is otherwise only taken on GPU.
+    with mock.patch.object(
+        dense_optimizer, "_use_dense_update", return_value=True):
+      for _ in range(3):
+        sparse_optimizer.apply_gradients(zip([grads], [sparse_var]))
+        dense_optimizer.apply_gradients(zip([grads], [dense_var]))
+    self.assertAllClose(dense_var, sparse_var)
+    self.assertAllClose(dense_optimizer._accumulators[0],
+                        sparse_optimizer._accumulators[0])
+
+  def testAdagradUseDenseUpdate(self):
+    optimizer = adagrad_new.Adagrad()
+    # `_use_dense_update` only reads the shape and device of the variable, so
+    # stand-ins let the GPU case run without a GPU.
+    gpu_device = "/job:localhost/replica:0/task:0/device:GPU:0"
+    gpu_var = mock.Mock(shape=tf.TensorShape([10, 1]), device=gpu_device)
+    dense_grads = tf.IndexedSlices(
+        tf.ones([5, 1]), tf.range(5), dense_shape=[10, 1])
+    self.assertTrue(optimizer._use_dense_update(dense_grads, gpu_var))
+
+    # Not above the density threshold.
+    sparse_grads = tf.IndexedSlices(
+        tf.ones([1, 1]), tf.constant([3]), dense_shape=[10, 1])
+    self.assertFalse(optimizer._use_dense_update(sparse_grads, gpu_var))
+
+    with tf.device("/CPU:0"):
+      cpu_var = tf.Variable(tf.zeros([10, 1]))
+    self.assertFalse(optimizer._use_dense_update(dense_grads, cpu_var))
+
+    empty_var = mock.Mock(shape=tf.TensorShape([0, 1]), device=gpu_device)
+    self.assertFalse(optimizer._use_dense_update(dense_grads, empty_var))
+
+    with tf.Graph().as_default():
+      unknown_size_grads = tf.IndexedSlices(
+          tf.compat.v1.placeholder(tf.float32, shape=[None, 1]),
+          tf.compat.v1.placeholder(tf.int32, shape=[None]),
+          dense_shape=[10, 1])
+      self.assertFalse(
+          optimizer._use_dense_update(unknown_size_grads, gpu_var))
+
+  @parameterized.named_parameters(("dense", False), ("sparse", True))
+  def testAdagradAccumulatorDtype(self, sparse):
+    var = tf.Variable([[1.0], [2.0], [3.0]])
+    reference_var = tf.Variable([[1.0], [2.0], [3.0]])
+    if sparse:
+      grads = tf.IndexedSlices(
+          tf.constant([[0.1], [0.2], [0.2]]), tf.constant([0, 2, 2]),
+          dense_shape=[3, 1])
+    else:
+      grads = tf.convert_to_tensor([[0.1], [0.0], [0.2]])
+    optimizer = adagrad_new.Adagrad(
+        learning_rate=0.1, accumulator_dtype=tf.bfloat16)
+    reference_optimizer = adagrad_new.Adagrad(learning_rate=0.1)
+    for _ in range(3):
+      optimizer.apply_gradients(zip([grads], [var]))
+      reference_optimizer.apply_gradients(zip([grads], [reference_var]))
+    self.assertEqual(optimizer._accumulators[0].dtype, tf.bfloat16)
+    self.assertEqual(var.dtype, tf.float32)
+    self.assertAllClose(var, reference_var, rtol=1e-2, atol=1e-2)
+    self.assertAllClose(
+        tf.cast(optimizer._accumulators[0], tf.float32),
+        reference_optimizer._accumulators[0], rtol=1e-2, atol=1e-2)
+
+    config = optimizer.get_config()
+    self.assertEqual(config["accumulator_dtype"], "bfloat16")
+    restored_optimizer = adagrad_new.Adagrad.from_config(config)
+    self.assertEqual(restored_optimizer.accumulator_dtype, tf.bfloat16)
+
   def testGetAndFromConfig(self):
     optimizer = adam_new.Adam(
         learning_rate=np.float64(0.05),
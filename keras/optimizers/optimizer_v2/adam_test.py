@@ -14,6 +14,8 @@
 # ==============================================================================
 """Tests for Adam."""
 
+import math
+
 import tensorflow.compat.v2 as tf
 
 from absl.testing import parameterized
@@ -33,10 +35,10 @@ def adam_update_numpy(param,
                       beta1=0.9,
                       beta2=0.999,
                       epsilon=1e-7):
-  lr_t = lr * np.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
+  lr_t = lr * math.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
 
-  m_t = beta1 * m + (1 - beta1) * g_t
-  v_t = beta2 * v + (1 - beta2) * g_t * g_t
+  m_t = m + (1 - beta1) * (g_t - m)
+  v_t = v + (1 - beta2) * (g_t * g_t - v)
 
   param_t = param - lr_t * m_t / (np.sqrt(v_t) + epsilon)
   return param_t, m_t, v_t
@@ -52,13 +54,19 @@ def adam_update_numpy_amsgrad(param,
                               beta1=0.9,
                               beta2=0.999,
                               epsilon=1e-7):
-  lr_t = lr * np.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
-
-  m_t = beta1 * m + (1 - beta1) * g_t
-  v_t = beta2 * v + (1 - beta2) * g_t * g_t
-  vhat_t = np.maximum(vhat, v_t)
-
-  param_t = param - lr_t * m_t / (np.sqrt(vhat_t) + epsilon)
+  lr_t = lr * math.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
+
+  m_t = g_t - m
+  m_t *= 1 - beta1
+  m_t += m
+  v_t = g_t * g_t - v
+  v_t *= 1 - beta2
+  v_t += v
+  vhat_t = np.fmax(vhat, v_t)
+
+  denom = np.sqrt(vhat_t)
+  denom += epsilon
+  param_t = param - lr_t * m_t / denom
   return param_t, m_t, v_t, vhat_t
 
 
@@ -73,19 +81,63 @@ def adam_sparse_update_numpy_amsgrad(param,
                                      beta1=0.9,
                                      beta2=0.999,
                                      epsilon=1e-7):
-  m_t, v_t, vhat_t, param_t = (np.copy(m), np.copy(v), np.copy(vhat),
-                               np.copy(param))
-  lr_t = lr * np.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
+  """Updates `param`, `m`, `v` and `vhat` in place for the given indices.
+
+  Gradients of repeated indices are summed before the update is applied.
+  """
+  indices, inverse = np.unique(indices, return_inverse=True)
+  summed_g_t = np.zeros((len(indices),) + g_t.shape[1:], dtype=g_t.dtype)
+  np.add.at(summed_g_t, inverse.ravel(), g_t)
+  g_t = summed_g_t
+  lr_t = lr * math.sqrt(1 - beta2**(t + 1)) / (1 - beta1**(t + 1))
   m_t_slice = beta1 * m[indices] + (1 - beta1) * g_t
   v_t_slice = beta2 * v[indices] + (1 - beta2) * g_t * g_t
-  m_t[indices] = m_t_slice
-  v_t[indices] = v_t_slice
-  v_hat_t = np.maximum(vhat_t, v_t)
-  v_hat_t_slice = v_hat_t[indices]
-  param_t_slice = param[indices] - (
-      lr_t * (m_t_slice / (np.sqrt(v_hat_t_slice) + epsilon)))
-  param_t[indices] = param_t_slice
-  return param_t, m_t, v_t, vhat_t
+  m[indices] = m_t_slice
+  v[indices] = v_t_slice
+  np.fmax(vhat, v, out=vhat)
+  param[indices] -= lr_t * (m_t_slice / (np.sqrt(vhat[indices]) + epsilon))
+
+
+def adam_update_numpy_multi(params,
+                            grads,
+                            t,
+                            *slots,
+                            update_fn=adam_update_numpy,
+                            **kwargs):
+  """Applies `update_fn` once to the concatenation of several variables.
+
+  Args:
+    params: List of parameter arrays.
+    grads: List of gradient arrays, matching `params`.
+    t: Zero-based step index.
+    *slots: Lists of slot values (e.g. `m` and `v`), matching `params`.
+    update_fn: The reference update to apply, e.g. `adam_update_numpy`.
+    **kwargs: Hyperparameters passed on to `update_fn`.
+
+  Returns:
+    A list holding the list of updated values of `params` followed by one for
+    each of `slots`.
+  """
+  split_points = np.cumsum([param.size for param in params])[:-1]
+
+  def concat(values):
+    return np.concatenate([value.ravel() for value in values])
+
+  results = update_fn(
+      concat(params), concat(grads), t, *[concat(slot) for slot in slots],
+      **kwargs)
+  return [[
+      value.reshape(param.shape)
+      for value, param in zip(np.split(result, split_points), params)
+  ] for result in results]
+
+
+_DTYPES = [tf.half, tf.float32, tf.float64]
+
+# Expected beta_1 and beta_2 powers at each of the three steps the tests run,
+# for the default beta_1=0.9 and beta_2=0.999.
+_BETA_1_POWERS = tuple(0.9**(t + 1) for t in range(3))
+_BETA_2_POWERS = tuple(0.999**(t + 1) for t in range(3))
 
 
 def get_beta_accumulators(opt, dtype):
@@ -99,429 +151,528 @@ def get_beta_accumulators(opt, dtype):
 
 class AdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
 
-  def testSparse(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.0, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.0, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0_np_indices = np.array([0, 2], dtype=np.int32)
-        grads0 = tf.IndexedSlices(
-            tf.constant(grads0_np[grads0_np_indices]),
-            tf.constant(grads0_np_indices), tf.constant([3]))
-        grads1_np_indices = np.array([0, 2], dtype=np.int32)
-        grads1 = tf.IndexedSlices(
-            tf.constant(grads1_np[grads1_np_indices]),
-            tf.constant(grads1_np_indices), tf.constant([3]))
-        opt = adam.Adam()
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 3.0, 4.0], self.evaluate(var1))
+  opt_cls = adam.Adam
+  # Tolerances of the dense update checks against the numpy reference.
+  rtol = 1e-6
+  atol = 1e-6
 
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-        # Run 3 steps of Adam
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          update.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testSparseDevicePlacement(self):
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testSparse(self, dtype):
     # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for index_dtype in [tf.int32, tf.int64]:
-      with tf.Graph().as_default(), self.cached_session(
-          force_gpu=tf.test.is_gpu_available()):
-        # If a GPU is available, tests that all optimizer ops can be placed on
-        # it (i.e. they have GPU kernels).
-        var = tf.Variable([[1.0], [2.0]])
-        indices = tf.constant([0, 1], dtype=index_dtype)
-        g_sum = lambda: tf.reduce_sum(tf.gather(var, indices))  # pylint: disable=cell-var-from-loop
-        optimizer = adam.Adam(3.0)
-        minimize_op = optimizer.minimize(g_sum, var_list=[var])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        minimize_op.run()
-
-  def testSparseRepeatedIndices(self):
+    with tf.Graph().as_default(), self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.0, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.0, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np)
+      var1 = tf.Variable(var1_np)
+      grads0_np_indices = np.array([0, 2], dtype=np.int32)
+      grads0 = tf.IndexedSlices(
+          tf.constant(grads0_np[grads0_np_indices]),
+          tf.constant(grads0_np_indices), tf.constant([3]))
+      grads1_np_indices = np.array([0, 2], dtype=np.int32)
+      grads1 = tf.IndexedSlices(
+          tf.constant(grads1_np[grads1_np_indices]),
+          tf.constant(grads1_np_indices), tf.constant([3]))
+      opt = self.opt_cls()
+      update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
+      # The same gradients, densified, take the dense update path.
+      dense_var0 = tf.Variable(var0_np)
+      dense_var1 = tf.Variable(var1_np)
+      dense_update = self.opt_cls().apply_gradients(
+          zip([tf.convert_to_tensor(grads0), tf.convert_to_tensor(grads1)],
+              [dense_var0, dense_var1]))
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+
+      # Fetch params to validate initial values
+      self.assertAllClose([1.0, 1.0, 2.0], self.evaluate(var0))
+      self.assertAllClose([3.0, 3.0, 4.0], self.evaluate(var1))
+
+      beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+      # Run 3 steps of Adam
+      for t in range(3):
+        beta_1_power_t, beta_2_power_t = self.evaluate(
+            [beta_1_power, beta_2_power])
+        self.assertAllCloseAccordingToType(_BETA_1_POWERS[t], beta_1_power_t)
+        self.assertAllCloseAccordingToType(_BETA_2_POWERS[t], beta_2_power_t)
+        self.evaluate([update, dense_update])
+
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1])
+
+        # Validate updated params
+        var0_t, var1_t, dense_var0_t, dense_var1_t = self.evaluate(
+            [var0, var1, dense_var0, dense_var1])
+        self.assertAllCloseAccordingToType(var0_np, var0_t)
+        self.assertAllCloseAccordingToType(var1_np, var1_t)
+        self.assertAllCloseAccordingToType(var0_t, dense_var0_t)
+        self.assertAllCloseAccordingToType(var1_t, dense_var1_t)
+
+  @parameterized.named_parameters(
+      (index_dtype.name, index_dtype) for index_dtype in [tf.int32, tf.int64])
+  def testSparseDevicePlacement(self, index_dtype):
     # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        repeated_index_update_var = tf.Variable(
-            [[1.0], [2.0]], dtype=dtype)
-        aggregated_update_var = tf.Variable(
-            [[1.0], [2.0]], dtype=dtype)
-        grad_repeated_index = tf.IndexedSlices(
-            tf.constant(
-                [0.1, 0.1], shape=[2, 1], dtype=dtype),
-            tf.constant([1, 1]),
-            tf.constant([2, 1]))
-        grad_aggregated = tf.IndexedSlices(
-            tf.constant(
-                [0.2], shape=[1, 1], dtype=dtype),
-            tf.constant([1]),
-            tf.constant([2, 1]))
-        repeated_update = adam.Adam().apply_gradients(
-            [(grad_repeated_index, repeated_index_update_var)])
-        aggregated_update = adam.Adam().apply_gradients(
-            [(grad_aggregated, aggregated_update_var)])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
+    # Without a GPU this still checks that the sparse update runs on CPU with
+    # int64 indices, which `testSparse` does not cover.
+    with tf.Graph().as_default(), self.cached_session(
+        force_gpu=tf.test.is_gpu_available()):
+      # If a GPU is available, tests that all optimizer ops can be placed on
+      # it (i.e. they have GPU kernels).
+      var = tf.Variable([[1.0], [2.0]])
+      indices = tf.constant([0, 1], dtype=index_dtype)
+      g_sum = lambda: tf.reduce_sum(tf.gather(var, indices))
+      optimizer = self.opt_cls(3.0)
+      minimize_op = optimizer.minimize(g_sum, var_list=[var])
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      minimize_op.run()
+
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testSparseRepeatedIndices(self, dtype):
+    # TODO(tanzheny, omalleyt): Fix test in eager mode.
+    with tf.Graph().as_default(), self.cached_session():
+      repeated_index_update_var = tf.Variable(
+          [[1.0], [2.0]], dtype=dtype)
+      aggregated_update_var = tf.Variable(
+          [[1.0], [2.0]], dtype=dtype)
+      grad_repeated_index = tf.IndexedSlices(
+          tf.constant(
+              [0.1, 0.1], shape=[2, 1], dtype=dtype),
+          tf.constant([1, 1]),
+          tf.constant([2, 1]))
+      grad_aggregated = tf.IndexedSlices(
+          tf.constant(
+              [0.2], shape=[1, 1], dtype=dtype),
+          tf.constant([1]),
+          tf.constant([2, 1]))
+      repeated_update = self.opt_cls().apply_gradients(
+          [(grad_repeated_index, repeated_index_update_var)])
+      aggregated_update = self.opt_cls().apply_gradients(
+          [(grad_aggregated, aggregated_update_var)])
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      self.assertAllClose(aggregated_update_var,
+                          self.evaluate(repeated_index_update_var))
+      for _ in range(3):
+        repeated_update.run()
+        aggregated_update.run()
         self.assertAllClose(aggregated_update_var,
                             self.evaluate(repeated_index_update_var))
-        for _ in range(3):
-          repeated_update.run()
-          aggregated_update.run()
-          self.assertAllClose(aggregated_update_var,
-                              self.evaluate(repeated_index_update_var))
-
-  def doTestBasic(self, use_callable_params=False):
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = lambda: 0.001
-        beta1 = lambda: 0.9
-        beta2 = lambda: 0.999
-        epsilon = lambda: 1e-8
-        if not use_callable_params:
-          learning_rate = learning_rate()
-          beta1 = beta1()
-          beta2 = beta2()
-          epsilon = epsilon()
-
-        opt = adam.Adam(learning_rate=learning_rate)
-        if not tf.executing_eagerly():
-          update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
 
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of Adam
-        for t in range(3):
+  def doTestBasic(self, dtype, use_callable_params=False):
+    with self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np, name="var0")
+      var1 = tf.Variable(var1_np, name="var1")
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+      grads_and_vars = list(zip([grads0, grads1], [var0, var1]))
+
+      learning_rate = lambda: 0.001
+      beta1 = lambda: 0.9
+      beta2 = lambda: 0.999
+      epsilon = lambda: 1e-8
+      if not use_callable_params:
+        learning_rate = learning_rate()
+        beta1 = beta1()
+        beta2 = beta2()
+        epsilon = epsilon()
+
+      opt = self.opt_cls(learning_rate=learning_rate)
+      if not tf.executing_eagerly():
+        update = opt.apply_gradients(grads_and_vars)
+        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      # Run 3 steps of Adam
+      for t in range(3):
+        # Eager tensors are values, so the powers are recomputed every step.
+        if tf.executing_eagerly():
           beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if not tf.executing_eagerly():
-            self.evaluate(update)
-          else:
-            opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
+        beta_1_power_t, beta_2_power_t = self.evaluate(
+            [beta_1_power, beta_2_power])
+        self.assertAllCloseAccordingToType(_BETA_1_POWERS[t], beta_1_power_t)
+        self.assertAllCloseAccordingToType(_BETA_2_POWERS[t], beta_2_power_t)
+        if not tf.executing_eagerly():
+          self.evaluate(update)
+        else:
+          opt.apply_gradients(grads_and_vars)
 
-  @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testResourceBasic(self):
-    self.doTestBasic()
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1])
 
-  @test_combinations.generate(test_combinations.combine(mode=["eager"]))
-  def testBasicCallableParams(self):
-    self.doTestBasic(use_callable_params=True)
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(
+            var0_np, var0_t, rtol=self.rtol, atol=self.atol)
+        self.assertAllCloseAccordingToType(
+            var1_np, var1_t, rtol=self.rtol, atol=self.atol)
 
   @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testBasicWithAmsgrad(self):
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, v0hat, m1, v1, v1hat = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        opt = adam.Adam(amsgrad=True)
-        if not tf.executing_eagerly():
-          update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
+      test_combinations.combine(mode=["graph", "eager"], dtype=_DTYPES))
+  def testResourceBasic(self, dtype):
+    self.doTestBasic(dtype)
 
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of Adam
-        for t in range(3):
-          beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if not tf.executing_eagerly():
-            self.evaluate(update)
-          else:
-            opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-          var0_np, m0, v0, v0hat = adam_update_numpy_amsgrad(
-              var0_np, grads0_np, t, m0, v0, v0hat)
-          var1_np, m1, v1, v1hat = adam_update_numpy_amsgrad(
-              var1_np, grads1_np, t, m1, v1, v1hat)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
+  @test_combinations.generate(
+      test_combinations.combine(mode=["eager"], dtype=_DTYPES))
+  def testBasicCallableParams(self, dtype):
+    self.doTestBasic(dtype, use_callable_params=True)
 
   @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testSparseWithAmsgrad(self):
-    # dtypes.half does not work on gpu + eager.
-    for dtype in [tf.float32, tf.float64]:
-      with self.cached_session():
-        m0 = np.array([[0.0], [0.0]])
-        v0 = np.array([[0.0], [0.0]])
-        v0hat = np.array([[0.0], [0.0]])
-        indices_np = np.array([1])
-        indices = tf.constant(indices_np, dtype=tf.int32)
-        var0_np = np.array([[1.0], [2.0]], dtype=dtype.as_numpy_dtype)
-        repeated_index_update_var = tf.Variable(var0_np, dtype=dtype)
-        aggregated_update_var = tf.Variable(var0_np, dtype=dtype)
-        grads0_np = np.array([[0.2]], dtype=dtype.as_numpy_dtype)
-        grad_repeated_index = tf.IndexedSlices(
-            tf.constant([0.1, 0.1], shape=[2, 1], dtype=dtype),
-            tf.constant([1, 1]), tf.constant([2, 1]))
-        grad_aggregated = tf.IndexedSlices(grads0_np, indices,
-                                            tf.constant([2, 1]))
-        opt_repeated = adam.Adam(amsgrad=True)
-        opt_aggregated = adam.Adam(amsgrad=True)
+      test_combinations.combine(mode=["graph", "eager"], dtype=_DTYPES))
+  def testBasicMultiTensor(self, dtype):
+    with self.cached_session():
+      np_dtype = dtype.as_numpy_dtype
+      shapes = [(2,), (3,), (2, 2), (1, 3), (4,), (2, 1, 2), (5,), (1,)]
+      rng = np.random.RandomState(0)
+      vars_np = [rng.uniform(1.0, 2.0, shape).astype(np_dtype)
+                 for shape in shapes]
+      grads_np = [rng.uniform(-0.1, 0.1, shape).astype(np_dtype)
+                  for shape in shapes]
+
+      var_list = [tf.Variable(var_np) for var_np in vars_np]
+      grads = [tf.constant(grad_np) for grad_np in grads_np]
+      grads_and_vars = list(zip(grads, var_list))
+
+      opt = self.opt_cls()
+      if not tf.executing_eagerly():
+        update = opt.apply_gradients(grads_and_vars)
+
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      m = [np.zeros_like(var_np) for var_np in vars_np]
+      v = [np.zeros_like(var_np) for var_np in vars_np]
+      # Run 3 steps of Adam
+      for t in range(3):
         if not tf.executing_eagerly():
-          repeated_update = opt_repeated.apply_gradients(
-              [(grad_repeated_index, repeated_index_update_var)])
-          aggregated_update = opt_aggregated.apply_gradients(
-              [(grad_aggregated, aggregated_update_var)])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        self.assertAllClose(
-            self.evaluate(aggregated_update_var),
-            self.evaluate(repeated_index_update_var))
-        for t in range(3):
-          if not tf.executing_eagerly():
-            self.evaluate(repeated_update)
-            self.evaluate(aggregated_update)
-          else:
-            opt_repeated.apply_gradients(
-                [(grad_repeated_index, repeated_index_update_var)])
-            opt_aggregated.apply_gradients(
-                [(grad_aggregated, aggregated_update_var)])
-
-          var0_np, m0, v0, v0hat = adam_sparse_update_numpy_amsgrad(
-              var0_np, indices_np, grads0_np, t, m0, v0, v0hat)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(
-              var0_np, self.evaluate(aggregated_update_var))
-          self.assertAllCloseAccordingToType(
-              self.evaluate(aggregated_update_var),
-              self.evaluate(repeated_index_update_var))
-
-  def testBasicWithLearningRateDecay(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = 0.001
-        beta_1 = 0.9
-        beta_2 = 0.999
-        epsilon = 1e-7
-        decay = 0.5
-
-        opt = adam.Adam(
-            learning_rate=learning_rate,
-            beta_1=beta_1,
-            beta_2=beta_2,
-            epsilon=epsilon,
-            decay=decay)
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of Adam
-        for t in range(3):
-          self.evaluate(update)
-          lr_np = learning_rate / (1 + decay * t)
-
-          var0_np, m0, v0 = adam_update_numpy(
-              var0_np, grads0_np, t, m0, v0, lr=lr_np)
-          var1_np, m1, v1 = adam_update_numpy(
-              var1_np, grads1_np, t, m1, v1, lr=lr_np)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testBasicWithLearningRateInverseTimeDecay(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = 0.001
-        decay = 0.5
-        lr_schedule = learning_rate_schedule.InverseTimeDecay(
-            learning_rate, decay_steps=1.0, decay_rate=decay)
-        beta_1 = 0.9
-        beta_2 = 0.999
-        epsilon = 1e-7
-
-        opt = adam.Adam(
-            learning_rate=lr_schedule,
-            beta_1=beta_1,
-            beta_2=beta_2,
-            epsilon=epsilon)
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of Adam
-        for t in range(3):
           self.evaluate(update)
+        else:
+          opt.apply_gradients(grads_and_vars)
 
-          lr_np = learning_rate / (1 + decay * t)
+        vars_np, m, v = adam_update_numpy_multi(vars_np, grads_np, t, m, v)
 
-          var0_np, m0, v0 = adam_update_numpy(
-              var0_np, grads0_np, t, m0, v0, lr=lr_np)
-          var1_np, m1, v1 = adam_update_numpy(
-              var1_np, grads1_np, t, m1, v1, lr=lr_np)
+        # Validate updated params
+        for expected, actual in zip(vars_np, self.evaluate(var_list)):
+          self.assertAllCloseAccordingToType(
+              expected, actual, rtol=self.rtol, atol=self.atol)
 
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
+  @test_combinations.generate(
+      test_combinations.combine(mode=["graph", "eager"], dtype=_DTYPES))
+  def testBasicWithAmsgrad(self, dtype):
+    with self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0, v0hat = (np.zeros_like(var0_np) for _ in range(3))
+      m1, v1, v1hat = (np.zeros_like(var1_np) for _ in range(3))
+
+      var0 = tf.Variable(var0_np, name="var0")
+      var1 = tf.Variable(var1_np, name="var1")
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+      grads_and_vars = list(zip([grads0, grads1], [var0, var1]))
+
+      opt = self.opt_cls(amsgrad=True)
+      if not tf.executing_eagerly():
+        update = opt.apply_gradients(grads_and_vars)
+        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
 
-  def testTensorLearningRate(self):
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      # Run 3 steps of Adam
+      for t in range(3):
+        # Eager tensors are values, so the powers are recomputed every step.
+        if tf.executing_eagerly():
+          beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+        beta_1_power_t, beta_2_power_t = self.evaluate(
+            [beta_1_power, beta_2_power])
+        self.assertAllCloseAccordingToType(_BETA_1_POWERS[t], beta_1_power_t)
+        self.assertAllCloseAccordingToType(_BETA_2_POWERS[t], beta_2_power_t)
+        if not tf.executing_eagerly():
+          self.evaluate(update)
+        else:
+          opt.apply_gradients(grads_and_vars)
+
+        (var0_np, var1_np), (m0, m1), (v0, v1), (v0hat, v1hat) = (
+            adam_update_numpy_multi(
+                [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1],
+                [v0, v1], [v0hat, v1hat], update_fn=adam_update_numpy_amsgrad))
+
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(
+            var0_np, var0_t, rtol=self.rtol, atol=self.atol)
+        self.assertAllCloseAccordingToType(
+            var1_np, var1_t, rtol=self.rtol, atol=self.atol)
+
+  # dtypes.half does not work on gpu + eager.
+  @test_combinations.generate(
+      test_combinations.combine(
+          mode=["graph", "eager"], dtype=[tf.float32, tf.float64]))
+  def testSparseWithAmsgrad(self, dtype):
+    with self.cached_session():
+      m0 = np.array([[0.0], [0.0]])
+      v0 = np.array([[0.0], [0.0]])
+      v0hat = np.array([[0.0], [0.0]])
+      indices_np = np.array([1])
+      indices = tf.constant(indices_np, dtype=tf.int32)
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([[1.0], [2.0]], dtype=np_dtype)
+      repeated_index_update_var = tf.Variable(var0_np, dtype=dtype)
+      aggregated_update_var = tf.Variable(var0_np, dtype=dtype)
+      grads0_np = np.array([[0.2]], dtype=np_dtype)
+      # Separate reference state for the update with a repeated index.
+      repeated_var0_np = var0_np.copy()
+      repeated_m0, repeated_v0, repeated_v0hat = (
+          np.zeros_like(m0) for _ in range(3))
+      repeated_indices_np = np.array([1, 1])
+      repeated_grads0_np = np.array([[0.1], [0.1]], dtype=np_dtype)
+      grad_repeated_index = tf.IndexedSlices(
+          tf.constant(repeated_grads0_np),
+          tf.constant(repeated_indices_np, dtype=tf.int32),
+          tf.constant([2, 1]))
+      grad_aggregated = tf.IndexedSlices(grads0_np, indices,
+                                          tf.constant([2, 1]))
+      repeated_index_gv = [(grad_repeated_index, repeated_index_update_var)]
+      aggregated_gv = [(grad_aggregated, aggregated_update_var)]
+      opt_repeated = self.opt_cls(amsgrad=True)
+      opt_aggregated = self.opt_cls(amsgrad=True)
+      if not tf.executing_eagerly():
+        repeated_update = opt_repeated.apply_gradients(repeated_index_gv)
+        aggregated_update = opt_aggregated.apply_gradients(aggregated_gv)
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      self.assertAllClose(
+          self.evaluate(aggregated_update_var),
+          self.evaluate(repeated_index_update_var))
+      for t in range(3):
+        if not tf.executing_eagerly():
+          self.evaluate([repeated_update, aggregated_update])
+        else:
+          opt_repeated.apply_gradients(repeated_index_gv)
+          opt_aggregated.apply_gradients(aggregated_gv)
+
+        adam_sparse_update_numpy_amsgrad(
+            var0_np, indices_np, grads0_np, t, m0, v0, v0hat)
+        adam_sparse_update_numpy_amsgrad(
+            repeated_var0_np, repeated_indices_np, repeated_grads0_np, t,
+            repeated_m0, repeated_v0, repeated_v0hat)
+
+        # Validate updated params
+        aggregated_t, repeated_index_t = self.evaluate(
+            [aggregated_update_var, repeated_index_update_var])
+        self.assertAllCloseAccordingToType(var0_np, aggregated_t)
+        self.assertAllCloseAccordingToType(repeated_var0_np, repeated_index_t)
+        self.assertAllCloseAccordingToType(aggregated_t, repeated_index_t)
+
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testBasicWithLearningRateDecay(self, dtype):
     # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-        opt = adam.Adam(tf.constant(0.001))
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 4.0], self.evaluate(var1))
-
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-        # Run 3 steps of Adam
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          update.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testSharing(self):
+    with tf.Graph().as_default(), self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np, name="var0")
+      var1 = tf.Variable(var1_np, name="var1")
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+
+      learning_rate = 0.001
+      beta_1 = 0.9
+      beta_2 = 0.999
+      epsilon = 1e-7
+      decay = 0.5
+
+      opt = self.opt_cls(
+          learning_rate=learning_rate,
+          beta_1=beta_1,
+          beta_2=beta_2,
+          epsilon=epsilon,
+          decay=decay)
+      update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
+
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      # Run 3 steps of Adam
+      for t in range(3):
+        self.evaluate(update)
+        lr_np = learning_rate / (1 + decay * t)
+
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1],
+            lr=lr_np)
+
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(var0_np, var0_t)
+        self.assertAllCloseAccordingToType(var1_np, var1_t)
+
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testBasicWithLearningRateInverseTimeDecay(self, dtype):
     # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-        opt = adam.Adam()
-        update1 = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        update2 = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 4.0], self.evaluate(var1))
-
-        # Run 3 steps of intertwined Adam1 and Adam2.
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if t % 2 == 0:
-            update1.run()
-          else:
-            update2.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
+    with tf.Graph().as_default(), self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np, name="var0")
+      var1 = tf.Variable(var1_np, name="var1")
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+
+      learning_rate = 0.001
+      decay = 0.5
+      lr_schedule = learning_rate_schedule.InverseTimeDecay(
+          learning_rate, decay_steps=1.0, decay_rate=decay)
+      beta_1 = 0.9
+      beta_2 = 0.999
+      epsilon = 1e-7
+
+      opt = self.opt_cls(
+          learning_rate=lr_schedule,
+          beta_1=beta_1,
+          beta_2=beta_2,
+          epsilon=epsilon)
+      update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
+
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+      # Run 3 steps of Adam
+      for t in range(3):
+        self.evaluate(update)
+
+        lr_np = learning_rate / (1 + decay * t)
+
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1],
+            lr=lr_np)
+
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(var0_np, var0_t)
+        self.assertAllCloseAccordingToType(var1_np, var1_t)
+
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testTensorLearningRate(self, dtype):
+    # TODO(tanzheny, omalleyt): Fix test in eager mode.
+    with tf.Graph().as_default(), self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np)
+      var1 = tf.Variable(var1_np)
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+      opt = self.opt_cls(tf.constant(0.001))
+      update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+
+      # Fetch params to validate initial values
+      self.assertAllClose([1.0, 2.0], self.evaluate(var0))
+      self.assertAllClose([3.0, 4.0], self.evaluate(var1))
+
+      beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+      # Run 3 steps of Adam
+      for t in range(3):
+        beta_1_power_t, beta_2_power_t = self.evaluate(
+            [beta_1_power, beta_2_power])
+        self.assertAllCloseAccordingToType(_BETA_1_POWERS[t], beta_1_power_t)
+        self.assertAllCloseAccordingToType(_BETA_2_POWERS[t], beta_2_power_t)
+        update.run()
+
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1])
+
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(var0_np, var0_t)
+        self.assertAllCloseAccordingToType(var1_np, var1_t)
+
+  @parameterized.named_parameters(
+      (dtype.name, dtype) for dtype in _DTYPES)
+  def testSharing(self, dtype):
+    # TODO(tanzheny, omalleyt): Fix test in eager mode.
+    with tf.Graph().as_default(), self.cached_session():
+      # Initialize variables for numpy implementation.
+      np_dtype = dtype.as_numpy_dtype
+      var0_np = np.array([1.0, 2.0], dtype=np_dtype)
+      grads0_np = np.array([0.1, 0.1], dtype=np_dtype)
+      var1_np = np.array([3.0, 4.0], dtype=np_dtype)
+      grads1_np = np.array([0.01, 0.01], dtype=np_dtype)
+      m0, v0 = (np.zeros_like(var0_np) for _ in range(2))
+      m1, v1 = (np.zeros_like(var1_np) for _ in range(2))
+
+      var0 = tf.Variable(var0_np)
+      var1 = tf.Variable(var1_np)
+      grads0 = tf.constant(grads0_np)
+      grads1 = tf.constant(grads1_np)
+      grads_and_vars = list(zip([grads0, grads1], [var0, var1]))
+      opt = self.opt_cls()
+      update1 = opt.apply_gradients(grads_and_vars)
+      update2 = opt.apply_gradients(grads_and_vars)
+      self.evaluate(tf.compat.v1.global_variables_initializer())
+
+      beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+
+      # Fetch params to validate initial values
+      self.assertAllClose([1.0, 2.0], self.evaluate(var0))
+      self.assertAllClose([3.0, 4.0], self.evaluate(var1))
+
+      # Run 3 steps of intertwined Adam1 and Adam2.
+      for t in range(3):
+        beta_1_power_t, beta_2_power_t = self.evaluate(
+            [beta_1_power, beta_2_power])
+        self.assertAllCloseAccordingToType(_BETA_1_POWERS[t], beta_1_power_t)
+        self.assertAllCloseAccordingToType(_BETA_2_POWERS[t], beta_2_power_t)
+        if t % 2 == 0:
+          update1.run()
+        else:
+          update2.run()
+
+        (var0_np, var1_np), (m0, m1), (v0, v1) = adam_update_numpy_multi(
+            [var0_np, var1_np], [grads0_np, grads1_np], t, [m0, m1], [v0, v1])
+
+        # Validate updated params
+        var0_t, var1_t = self.evaluate([var0, var1])
+        self.assertAllCloseAccordingToType(var0_np, var0_t)
+        self.assertAllCloseAccordingToType(var1_np, var1_t)
 
   @test_combinations.generate(test_combinations.combine(mode=["eager"]))
   def testSlotsUniqueEager(self):
     v1 = tf.Variable(1.)
     v2 = tf.Variable(1.)
-    opt = adam.Adam(1.)
+    opt = self.opt_cls(1.)
     opt.minimize(lambda: v1 + v2, var_list=[v1, v2])
     # There should be iteration, and two unique slot variables for v1 and v2.
     self.assertLen(set(v.ref() for v in opt.variables()), 5)
@@ -530,7 +681,7 @@ class AdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
 
   def testSetWeightsFromV1AdamWithoutMinimize(self):
     keras_v1_adam = optimizer_v1.Adam()
-    keras_v2_adam = adam.Adam()
+    keras_v2_adam = self.opt_cls()
     keras_v2_adam.set_weights(keras_v1_adam.get_weights())
     keras_v1_iteration = keras_v1_adam.iterations
     keras_v2_iteration = keras_v2_adam.iterations
@@ -539,9 +690,9 @@ class AdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
         self.evaluate(keras_v1_iteration), self.evaluate(keras_v2_iteration))
 
   def testConstructAdamWithLR(self):
-    opt = adam.Adam(lr=1.0)
-    opt_2 = adam.Adam(learning_rate=0.1, lr=1.0)
-    opt_3 = adam.Adam(learning_rate=0.1)
+    opt = self.opt_cls(lr=1.0)
+    opt_2 = self.opt_cls(learning_rate=0.1, lr=1.0)
+    opt_3 = self.opt_cls(learning_rate=0.1)
     self.assertIsInstance(opt.lr, tf.Variable)
     self.assertIsInstance(opt_2.lr, tf.Variable)
     self.assertIsInstance(opt_3.lr, tf.Variable)
@@ -552,429 +703,11 @@ class AdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
     self.assertAllClose(self.evaluate(opt_3.lr), (0.1))
 
 
-class NonFusedAdamOptimizerTest(tf.test.TestCase, parameterized.TestCase):
-
-  def testSparse(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.0, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.0, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0_np_indices = np.array([0, 2], dtype=np.int32)
-        grads0 = tf.IndexedSlices(
-            tf.constant(grads0_np[grads0_np_indices]),
-            tf.constant(grads0_np_indices), tf.constant([3]))
-        grads1_np_indices = np.array([0, 2], dtype=np.int32)
-        grads1 = tf.IndexedSlices(
-            tf.constant(grads1_np[grads1_np_indices]),
-            tf.constant(grads1_np_indices), tf.constant([3]))
-        opt = adam.NonFusedAdam()
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 3.0, 4.0], self.evaluate(var1))
-
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          update.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testSparseDevicePlacement(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for index_dtype in [tf.int32, tf.int64]:
-      with tf.Graph().as_default(), self.cached_session(
-          force_gpu=tf.test.is_gpu_available()):
-        # If a GPU is available, tests that all optimizer ops can be placed on
-        # it (i.e. they have GPU kernels).
-        var = tf.Variable([[1.0], [2.0]])
-        indices = tf.constant([0, 1], dtype=index_dtype)
-        g_sum = lambda: tf.reduce_sum(tf.gather(var, indices))  # pylint: disable=cell-var-from-loop
-        optimizer = adam.NonFusedAdam(3.0)
-        minimize_op = optimizer.minimize(g_sum, var_list=[var])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        minimize_op.run()
-
-  def testSparseRepeatedIndices(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        repeated_index_update_var = tf.Variable(
-            [[1.0], [2.0]], dtype=dtype)
-        aggregated_update_var = tf.Variable(
-            [[1.0], [2.0]], dtype=dtype)
-        grad_repeated_index = tf.IndexedSlices(
-            tf.constant(
-                [0.1, 0.1], shape=[2, 1], dtype=dtype),
-            tf.constant([1, 1]),
-            tf.constant([2, 1]))
-        grad_aggregated = tf.IndexedSlices(
-            tf.constant(
-                [0.2], shape=[1, 1], dtype=dtype),
-            tf.constant([1]),
-            tf.constant([2, 1]))
-        repeated_update = adam.NonFusedAdam().apply_gradients(
-            [(grad_repeated_index, repeated_index_update_var)])
-        aggregated_update = adam.NonFusedAdam().apply_gradients(
-            [(grad_aggregated, aggregated_update_var)])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        self.assertAllClose(aggregated_update_var,
-                            self.evaluate(repeated_index_update_var))
-        for _ in range(3):
-          repeated_update.run()
-          aggregated_update.run()
-          self.assertAllClose(aggregated_update_var,
-                              self.evaluate(repeated_index_update_var))
-
-  def doTestBasic(self, use_callable_params=False):
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = lambda: 0.001
-        beta1 = lambda: 0.9
-        beta2 = lambda: 0.999
-        epsilon = lambda: 1e-8
-        if not use_callable_params:
-          learning_rate = learning_rate()
-          beta1 = beta1()
-          beta2 = beta2()
-          epsilon = epsilon()
-
-        opt = adam.NonFusedAdam(learning_rate=learning_rate)
-        if not tf.executing_eagerly():
-          update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if not tf.executing_eagerly():
-            self.evaluate(update)
-          else:
-            opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(
-              var0_np, self.evaluate(var0), rtol=1e-4, atol=1e-4)
-          self.assertAllCloseAccordingToType(
-              var1_np, self.evaluate(var1), rtol=1e-4, atol=1e-4)
-
-  @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testResourceBasic(self):
-    self.doTestBasic()
-
-  @test_combinations.generate(test_combinations.combine(mode=["eager"]))
-  def testBasicCallableParams(self):
-    self.doTestBasic(use_callable_params=True)
-
-  @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testBasicWithAmsgrad(self):
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, v0hat, m1, v1, v1hat = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        opt = adam.NonFusedAdam(amsgrad=True)
-        if not tf.executing_eagerly():
-          update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if not tf.executing_eagerly():
-            self.evaluate(update)
-          else:
-            opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-          var0_np, m0, v0, v0hat = adam_update_numpy_amsgrad(
-              var0_np, grads0_np, t, m0, v0, v0hat)
-          var1_np, m1, v1, v1hat = adam_update_numpy_amsgrad(
-              var1_np, grads1_np, t, m1, v1, v1hat)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(
-              var0_np, self.evaluate(var0), rtol=1e-4, atol=1e-4)
-          self.assertAllCloseAccordingToType(
-              var1_np, self.evaluate(var1), rtol=1e-4, atol=1e-4)
-
-  @test_combinations.generate(
-      test_combinations.combine(mode=["graph", "eager"]))
-  def testSparseWithAmsgrad(self):
-    # dtypes.half does not work on gpu + eager.
-    for dtype in [tf.float32, tf.float64]:
-      with self.cached_session():
-        m0 = np.array([[0.0], [0.0]])
-        v0 = np.array([[0.0], [0.0]])
-        v0hat = np.array([[0.0], [0.0]])
-        indices_np = np.array([1])
-        indices = tf.constant(indices_np, dtype=tf.int32)
-        var0_np = np.array([[1.0], [2.0]], dtype=dtype.as_numpy_dtype)
-        repeated_index_update_var = tf.Variable(var0_np, dtype=dtype)
-        aggregated_update_var = tf.Variable(var0_np, dtype=dtype)
-        grads0_np = np.array([[0.2]], dtype=dtype.as_numpy_dtype)
-        grad_repeated_index = tf.IndexedSlices(
-            tf.constant([0.1, 0.1], shape=[2, 1], dtype=dtype),
-            tf.constant([1, 1]), tf.constant([2, 1]))
-        grad_aggregated = tf.IndexedSlices(grads0_np, indices,
-                                            tf.constant([2, 1]))
-        opt_repeated = adam.NonFusedAdam(amsgrad=True)
-        opt_aggregated = adam.NonFusedAdam(amsgrad=True)
-        if not tf.executing_eagerly():
-          repeated_update = opt_repeated.apply_gradients(
-              [(grad_repeated_index, repeated_index_update_var)])
-          aggregated_update = opt_aggregated.apply_gradients(
-              [(grad_aggregated, aggregated_update_var)])
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        self.assertAllClose(
-            self.evaluate(aggregated_update_var),
-            self.evaluate(repeated_index_update_var))
-        for t in range(3):
-          if not tf.executing_eagerly():
-            self.evaluate(repeated_update)
-            self.evaluate(aggregated_update)
-          else:
-            opt_repeated.apply_gradients(
-                [(grad_repeated_index, repeated_index_update_var)])
-            opt_aggregated.apply_gradients(
-                [(grad_aggregated, aggregated_update_var)])
-
-          var0_np, m0, v0, v0hat = adam_sparse_update_numpy_amsgrad(
-              var0_np, indices_np, grads0_np, t, m0, v0, v0hat)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(
-              var0_np, self.evaluate(aggregated_update_var))
-          self.assertAllCloseAccordingToType(
-              self.evaluate(aggregated_update_var),
-              self.evaluate(repeated_index_update_var))
-
-  def testBasicWithLearningRateDecay(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = 0.001
-        beta_1 = 0.9
-        beta_2 = 0.999
-        epsilon = 1e-7
-        decay = 0.5
-
-        opt = adam.NonFusedAdam(
-            learning_rate=learning_rate,
-            beta_1=beta_1,
-            beta_2=beta_2,
-            epsilon=epsilon,
-            decay=decay)
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          self.evaluate(update)
-          lr_np = learning_rate / (1 + decay * t)
-
-          var0_np, m0, v0 = adam_update_numpy(
-              var0_np, grads0_np, t, m0, v0, lr=lr_np)
-          var1_np, m1, v1 = adam_update_numpy(
-              var1_np, grads1_np, t, m1, v1, lr=lr_np)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testBasicWithLearningRateInverseTimeDecay(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for i, dtype in enumerate([tf.half, tf.float32, tf.float64]):
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np, name="var0_%d" % i)
-        var1 = tf.Variable(var1_np, name="var1_%d" % i)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-
-        learning_rate = 0.001
-        decay = 0.5
-        lr_schedule = learning_rate_schedule.InverseTimeDecay(
-            learning_rate, decay_steps=1.0, decay_rate=decay)
-        beta_1 = 0.9
-        beta_2 = 0.999
-        epsilon = 1e-7
-
-        opt = adam.NonFusedAdam(
-            learning_rate=lr_schedule,
-            beta_1=beta_1,
-            beta_2=beta_2,
-            epsilon=epsilon)
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          self.evaluate(update)
-
-          lr_np = learning_rate / (1 + decay * t)
-
-          var0_np, m0, v0 = adam_update_numpy(
-              var0_np, grads0_np, t, m0, v0, lr=lr_np)
-          var1_np, m1, v1 = adam_update_numpy(
-              var1_np, grads1_np, t, m1, v1, lr=lr_np)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testTensorLearningRate(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-        opt = adam.NonFusedAdam(tf.constant(0.001))
-        update = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 4.0], self.evaluate(var1))
-
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
-        # Run 3 steps of NonFusedAdam
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          update.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
-
-  def testSharing(self):
-    # TODO(tanzheny, omalleyt): Fix test in eager mode.
-    for dtype in [tf.half, tf.float32, tf.float64]:
-      with tf.Graph().as_default(), self.cached_session():
-        # Initialize variables for numpy implementation.
-        m0, v0, m1, v1 = 0.0, 0.0, 0.0, 0.0
-        var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
-        grads0_np = np.array([0.1, 0.1], dtype=dtype.as_numpy_dtype)
-        var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
-        grads1_np = np.array([0.01, 0.01], dtype=dtype.as_numpy_dtype)
-
-        var0 = tf.Variable(var0_np)
-        var1 = tf.Variable(var1_np)
-        grads0 = tf.constant(grads0_np)
-        grads1 = tf.constant(grads1_np)
-        opt = adam.NonFusedAdam()
-        update1 = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        update2 = opt.apply_gradients(zip([grads0, grads1], [var0, var1]))
-        self.evaluate(tf.compat.v1.global_variables_initializer())
-
-        beta_1_power, beta_2_power = get_beta_accumulators(opt, dtype)
+class NonFusedAdamOptimizerTest(AdamOptimizerTest):
 
-        # Fetch params to validate initial values
-        self.assertAllClose([1.0, 2.0], self.evaluate(var0))
-        self.assertAllClose([3.0, 4.0], self.evaluate(var1))
-
-        # Run 3 steps of intertwined NonFusedAdam1 and NonFusedAdam2.
-        for t in range(3):
-          self.assertAllCloseAccordingToType(0.9**(t + 1),
-                                             self.evaluate(beta_1_power))
-          self.assertAllCloseAccordingToType(0.999**(t + 1),
-                                             self.evaluate(beta_2_power))
-          if t % 2 == 0:
-            update1.run()
-          else:
-            update2.run()
-
-          var0_np, m0, v0 = adam_update_numpy(var0_np, grads0_np, t, m0, v0)
-          var1_np, m1, v1 = adam_update_numpy(var1_np, grads1_np, t, m1, v1)
-
-          # Validate updated params
-          self.assertAllCloseAccordingToType(var0_np, self.evaluate(var0))
-          self.assertAllCloseAccordingToType(var1_np, self.evaluate(var1))
+  opt_cls = adam.NonFusedAdam
+  rtol = 1e-4
+  atol = 1e-4
 
 
 if __name__ == "__main__":